@@ -20,6 +20,7 @@ def init_db():
     Initialize the database with required tables:
     - suppliers: stores supplier info, geocoding, and risk scores
     - events: stores news and weather/disaster events
+    - ai_cache: stores raw GPT responses keyed by a hash of the prompt
     """
     conn = get_connection()
     cursor = conn.cursor()
@@ -64,6 +65,15 @@ def init_db():
     except Exception:
         pass  # Column already exists
 
+    # AI recommendation cache (prompt hash -> raw JSON response)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ai_cache (
+            input_hash TEXT PRIMARY KEY,
+            response TEXT NOT NULL,
+            created_at TEXT
+        )
+    """)
+
     conn.commit()
     conn.close()
 
@@ -128,6 +138,25 @@ def update_supplier_risk(supplier_name: str, risk_score: float, risk_level: str,
     conn.close()
 
 
+def update_supplier_risks_bulk(updates: list[tuple[str, float, str, str]]):
+    """
+    update_supplier_risk for many suppliers in one transaction.
+    updates holds (supplier_name, risk_score, risk_level, summary) tuples.
+    """
+    if not updates:
+        return
+    now = datetime.utcnow().isoformat()
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.executemany("""
+        UPDATE suppliers
+        SET risk_score=?, risk_level=?, event_summary=?, last_updated=?
+        WHERE supplier_name=?
+    """, [(score, level, summary, now, name) for name, score, level, summary in updates])
+    conn.commit()
+    conn.close()
+
+
 def get_all_suppliers() -> pd.DataFrame:
     """Return all suppliers as a DataFrame."""
     conn = get_connection()
@@ -179,3 +208,35 @@ def purge_old_events(max_age_days: int = 21):
     """, (cutoff,))
     conn.commit()
     conn.close()
+
+
+def get_cached_ai_response(input_hash: str, max_age_hours: int = 24):
+    """Return the cached AI response for input_hash, or None if missing or expired."""
+    from datetime import timedelta
+    cutoff = (datetime.utcnow() - timedelta(hours=max_age_hours)).isoformat()
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            "SELECT response FROM ai_cache WHERE input_hash=? AND created_at >= ?",
+            (input_hash, cutoff)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        row = None  # Table not created yet (init_db not run)
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+def cache_ai_response(input_hash: str, response: str):
+    """Store (or refresh) the AI response for input_hash."""
+    conn = get_connection()
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO ai_cache (input_hash, response, created_at) VALUES (?, ?, ?)",
+            (input_hash, response, datetime.utcnow().isoformat())
+        )
+        conn.commit()
+    except sqlite3.OperationalError:
+        pass  # Table not created yet (init_db not run)
+    finally:
+        conn.close()
@@ -11,13 +11,20 @@ Works in two modes:
 """
 
 import os
-import json
+import re
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Optional
+from enum import IntEnum
+from operator import itemgetter
+from typing import Literal, NamedTuple, Optional
+from pydantic import BaseModel, ConfigDict
+
+from database import get_cached_ai_response, cache_ai_response
 
 # ─── Data Classes ─────────────────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     priority: int           # 1 = most urgent
     action: str             # Short action label
@@ -27,7 +34,7 @@ class Action:
     category: str           # inventory | redirect | dual_source | monitor | escalate
 
 
-@dataclass
+@dataclass(slots=True)
 class RecommendationReport:
     supplier_name: str
     risk_score: float
@@ -41,85 +48,123 @@ class RecommendationReport:
 
 
 # ─── Disruption Type Profiles ─────────────────────────────────────────────────
-# Each disruption type has different characteristics that drive different advice
-
-DISRUPTION_PROFILES = {
-    "natural_disaster": {
-        "typical_duration":  "1–4 weeks",
-        "predictability":    "moderate",   # typhoons have warning, earthquakes don't
-        "recovery_speed":    "slow",
-        "stock_up_advice":   True,
-        "redirect_advice":   True,
-        "typical_notice":    "0–10 days depending on type",
-    },
-    "labor_strike": {
-        "typical_duration":  "1–3 weeks",
-        "predictability":    "high",       # usually announced in advance
-        "recovery_speed":    "moderate",
-        "stock_up_advice":   True,
-        "redirect_advice":   True,
-        "typical_notice":    "3–14 days (usually announced)",
-    },
-    "war_conflict": {
-        "typical_duration":  "months to years",
-        "predictability":    "low",
-        "recovery_speed":    "very slow",
-        "stock_up_advice":   False,        # stocking up doesn't help long-term conflicts
-        "redirect_advice":   True,
-        "typical_notice":    "little to none",
-    },
-    "trade_policy": {
-        "typical_duration":  "months to years",
-        "predictability":    "moderate",
-        "recovery_speed":    "slow",
-        "stock_up_advice":   True,         # tariff hikes — stock before they hit
-        "redirect_advice":   True,
-        "typical_notice":    "days to weeks (policy announcements)",
-    },
-    "logistics_failure": {
-        "typical_duration":  "days to 2 weeks",
-        "predictability":    "low",
-        "recovery_speed":    "fast",
-        "stock_up_advice":   True,
-        "redirect_advice":   False,        # usually resolves before redirect is practical
-        "typical_notice":    "0–3 days",
-    },
-    "infrastructure_damage": {
-        "typical_duration":  "1–8 weeks",
-        "predictability":    "low",
-        "recovery_speed":    "moderate",
-        "stock_up_advice":   True,
-        "redirect_advice":   True,
-        "typical_notice":    "0–2 days",
-    },
-    "shortage": {
-        "typical_duration":  "weeks to months",
-        "predictability":    "moderate",
-        "recovery_speed":    "slow",
-        "stock_up_advice":   True,
-        "redirect_advice":   True,
-        "typical_notice":    "days to weeks",
-    },
-    "other": {
-        "typical_duration":  "unknown",
-        "predictability":    "low",
-        "recovery_speed":    "moderate",
-        "stock_up_advice":   True,
-        "redirect_advice":   False,
-        "typical_notice":    "unknown",
-    },
-}
+# Each disruption type has different characteristics that drive different advice.
+# Profiles and labels are tuples indexed by DType, so lookups are plain indexing.
+
+class DType(IntEnum):
+    NATURAL_DISASTER      = 0
+    LABOR_STRIKE          = 1
+    WAR_CONFLICT          = 2
+    TRADE_POLICY          = 3
+    LOGISTICS_FAILURE     = 4
+    INFRASTRUCTURE_DAMAGE = 5
+    SHORTAGE              = 6
+    OTHER                 = 7
+
+
+DTYPE_LABELS = tuple(d.name.lower().replace("_", " ") for d in DType)
+
+
+class DisruptionProfile(NamedTuple):
+    """Static characteristics of a disruption type, indexed by DType."""
+    duration:       str
+    predictability: str
+    recovery:       str
+    stock_up:       bool
+    redirect:       bool
+    notice:         str
+
+
+DISRUPTION_PROFILES = (
+    DisruptionProfile(  # DType.NATURAL_DISASTER
+        duration=       "1–4 weeks",
+        predictability= "moderate",   # typhoons have warning, earthquakes don't
+        recovery=       "slow",
+        stock_up=       True,
+        redirect=       True,
+        notice=         "0–10 days depending on type",
+    ),
+    DisruptionProfile(  # DType.LABOR_STRIKE
+        duration=       "1–3 weeks",
+        predictability= "high",       # usually announced in advance
+        recovery=       "moderate",
+        stock_up=       True,
+        redirect=       True,
+        notice=         "3–14 days (usually announced)",
+    ),
+    DisruptionProfile(  # DType.WAR_CONFLICT
+        duration=       "months to years",
+        predictability= "low",
+        recovery=       "very slow",
+        stock_up=       False,        # stocking up doesn't help long-term conflicts
+        redirect=       True,
+        notice=         "little to none",
+    ),
+    DisruptionProfile(  # DType.TRADE_POLICY
+        duration=       "months to years",
+        predictability= "moderate",
+        recovery=       "slow",
+        stock_up=       True,         # tariff hikes — stock before they hit
+        redirect=       True,
+        notice=         "days to weeks (policy announcements)",
+    ),
+    DisruptionProfile(  # DType.LOGISTICS_FAILURE
+        duration=       "days to 2 weeks",
+        predictability= "low",
+        recovery=       "fast",
+        stock_up=       True,
+        redirect=       False,        # usually resolves before redirect is practical
+        notice=         "0–3 days",
+    ),
+    DisruptionProfile(  # DType.INFRASTRUCTURE_DAMAGE
+        duration=       "1–8 weeks",
+        predictability= "low",
+        recovery=       "moderate",
+        stock_up=       True,
+        redirect=       True,
+        notice=         "0–2 days",
+    ),
+    DisruptionProfile(  # DType.SHORTAGE
+        duration=       "weeks to months",
+        predictability= "moderate",
+        recovery=       "slow",
+        stock_up=       True,
+        redirect=       True,
+        notice=         "days to weeks",
+    ),
+    DisruptionProfile(  # DType.OTHER
+        duration=       "unknown",
+        predictability= "low",
+        recovery=       "moderate",
+        stock_up=       True,
+        redirect=       False,
+        notice=         "unknown",
+    ),
+)
 
 # ─── Tier-Specific Advice ─────────────────────────────────────────────────────
 
-TIER_CONTEXT = {
-    "1": "This is a Tier 1 (direct) supplier — disruption impacts you immediately.",
-    "2": "This is a Tier 2 supplier — disruption affects your Tier 1 suppliers first, giving you slightly more buffer time.",
-    "3": "This is a Tier 3 (raw material) supplier — you likely have 2–4 weeks buffer before this reaches your production.",
-}
+# Indexed by tier number; index 0 is the fallback for unknown tiers.
+TIER_CONTEXT = (
+    "",
+    "This is a Tier 1 (direct) supplier — disruption impacts you immediately.",
+    "This is a Tier 2 supplier — disruption affects your Tier 1 suppliers first, giving you slightly more buffer time.",
+    "This is a Tier 3 (raw material) supplier — you likely have 2–4 weeks buffer before this reaches your production.",
+)
+
+
+def _tier_index(supplier_tier) -> int:
+    """Map a tier value ("1", 2, ...) to an index into TIER_CONTEXT, 0 if unknown."""
+    try:
+        tier = int(supplier_tier)
+    except (TypeError, ValueError):
+        return 0
+    return tier if 0 < tier < len(TIER_CONTEXT) else 0
 
 # ─── Rule-Based Recommendation Engine ────────────────────────────────────────
 
+MAX_DO_NOT_DO = 4   # Max "don't" warnings shown per supplier
+
 def _score_to_urgency(score: float) -> str:
     if score >= 75: return "CRITICAL"
     if score >= 60: return "HIGH"
@@ -128,40 +173,98 @@ def _score_to_urgency(score: float) -> str:
     return "WATCH"
 
 
-def _detect_disruption_types(breakdown: list[dict]) -> list[str]:
-    """Infer disruption types from event titles in the breakdown."""
-    types = set()
-    for ev in breakdown[:5]:
-        title = ev.get("title", "").lower()
-        if any(w in title for w in ["earthquake", "tsunami", "flood", "typhoon",
-                                     "hurricane", "cyclone", "storm", "wildfire"]):
-            types.add("natural_disaster")
-        if any(w in title for w in ["strike", "walkout", "labor", "union", "worker"]):
-            types.add("labor_strike")
-        if any(w in title for w in ["war", "conflict", "military", "invasion",
-                                     "missile", "attack", "coup"]):
-            types.add("war_conflict")
-        if any(w in title for w in ["tariff", "sanction", "embargo", "trade war",
-                                     "export ban", "import ban"]):
-            types.add("trade_policy")
-        if any(w in title for w in ["port congestion", "vessel", "grounded",
-                                     "canal", "shipping delay", "blocked"]):
-            types.add("logistics_failure")
-        if any(w in title for w in ["explosion", "fire", "collapse", "pipeline",
-                                     "power outage", "blackout"]):
-            types.add("infrastructure_damage")
-        if any(w in title for w in ["shortage", "scarcity", "rationing",
-                                     "semiconductor", "chip shortage"]):
-            types.add("shortage")
-    return list(types) if types else ["other"]
-
-
-def _closest_event_distance(breakdown: list[dict]) -> Optional[int]:
-    """Return the distance in miles of the closest scored event, if any."""
-    for ev in breakdown:
-        if ev.get("miles") is not None and ev.get("counted"):
-            return ev["miles"]
-    return None
+# Events further than this from the supplier never drive advice or prompt text
+MAX_RELEVANT_MILES = 1500
+
+# Title keywords that identify each disruption type, compiled once at import
+_DTYPE_PATTERNS = tuple(
+    (dtype, re.compile("|".join(map(re.escape, words))))
+    for dtype, words in (
+        (DType.NATURAL_DISASTER,      ["earthquake", "tsunami", "flood", "typhoon",
+                                       "hurricane", "cyclone", "storm", "wildfire"]),
+        (DType.LABOR_STRIKE,          ["strike", "walkout", "labor", "union", "worker"]),
+        (DType.WAR_CONFLICT,          ["war", "conflict", "military", "invasion",
+                                       "missile", "attack", "coup"]),
+        (DType.TRADE_POLICY,          ["tariff", "sanction", "embargo", "trade war",
+                                       "export ban", "import ban"]),
+        (DType.LOGISTICS_FAILURE,     ["port congestion", "vessel", "grounded",
+                                       "canal", "shipping delay", "blocked"]),
+        (DType.INFRASTRUCTURE_DAMAGE, ["explosion", "fire", "collapse", "pipeline",
+                                       "power outage", "blackout"]),
+        (DType.SHORTAGE,              ["shortage", "scarcity", "rationing",
+                                       "semiconductor", "chip shortage"]),
+    )
+)
+
+
+class BreakdownEvent(NamedTuple):
+    """The fields of a score-breakdown event that recommendations read."""
+    title:     str
+    miles:     Optional[int]
+    counted:   bool
+    signal:    str
+    proximity: str
+    published: str
+
+    @classmethod
+    def from_dict(cls, ev: dict) -> "BreakdownEvent":
+        return cls(
+            ev.get("title", ""), ev.get("miles"), bool(ev.get("counted")),
+            ev.get("signal", ""), ev.get("proximity", ""), ev.get("published", ""),
+        )
+
+
+@dataclass(slots=True)
+class BreakdownDigest:
+    closest_miles: Optional[int]        # Nearest counted event with a known distance
+    top5_counted: list[BreakdownEvent]  # First 5 counted events, in breakdown order
+    disruption_types: list[int]         # DType values inferred from the counted titles
+    top_title: str                      # Title of the highest-ranked relevant event
+
+
+def _digest_breakdown(breakdown: list[dict]) -> BreakdownDigest:
+    """
+    Summarise a score breakdown in a single pass.
+    Events beyond MAX_RELEVANT_MILES are dropped up front.
+    """
+    closest_miles = None
+    top5_counted  = []
+    types         = set()
+    top_title     = None
+
+    for ev in map(BreakdownEvent.from_dict, breakdown):
+        miles = ev.miles
+        if miles is not None and miles > MAX_RELEVANT_MILES:
+            continue
+        if top_title is None:
+            top_title = ev.title[:100]
+        if not ev.counted:
+            continue
+
+        if miles is not None and (closest_miles is None or miles < closest_miles):
+            closest_miles = miles
+
+        title = ev.title.lower()
+        for dtype, pattern in _DTYPE_PATTERNS:
+            if dtype not in types and pattern.search(title):
+                types.add(dtype)
+
+        top5_counted.append(ev)
+        if len(top5_counted) == 5:
+            break
+
+    return BreakdownDigest(
+        closest_miles=closest_miles,
+        top5_counted=top5_counted,
+        disruption_types=sorted(types) if types else [DType.OTHER],
+        top_title=top_title if top_title is not None else "No events detected",
+    )
+
+
+def _add_dont(do_not_do: dict[str, None], warning: str) -> None:
+    """Add a warning to the ordered do-not-do set unless it is already full."""
+    if len(do_not_do) < MAX_DO_NOT_DO:
+        do_not_do[warning] = None
 
 
 def generate_rule_based_recommendations(
@@ -179,16 +282,17 @@ def generate_rule_based_recommendations(
     Generate actionable recommendations using rule-based logic.
     No API key required. Always available.
     """
+    digest           = _digest_breakdown(breakdown)
     urgency          = _score_to_urgency(risk_score)
-    disruption_types = _detect_disruption_types(breakdown)
-    closest_miles    = _closest_event_distance(breakdown)
-    tier_note        = TIER_CONTEXT.get(str(supplier_tier), "")
-    top_event_title  = breakdown[0]["title"][:100] if breakdown else "No events detected"
-    counted_events   = [e for e in breakdown if e.get("counted")]
+    disruption_types = digest.disruption_types
+    closest_miles    = digest.closest_miles
+    tier_idx         = _tier_index(supplier_tier)
+    tier_note        = TIER_CONTEXT[tier_idx]
+    top_event_title  = digest.top_title
 
     # Build situation summary
-    dist_str = f"{closest_miles:,} miles from {supplier_city}" if closest_miles else f"in {supplier_country}"
-    dtype_str = " and ".join(disruption_types).replace("_", " ")
+    dist_str = f"{closest_miles:,} miles from {supplier_city}" if closest_miles is not None else f"in {supplier_country}"
+    dtype_str = " and ".join(DTYPE_LABELS[d] for d in disruption_types)
 
     situation_summary = (
         f"{supplier_name} in {supplier_city}, {supplier_country} is currently rated "
@@ -199,279 +303,284 @@ def generate_rule_based_recommendations(
         f"{'Immediate action is recommended.' if risk_score >= 60 else 'Situation warrants close monitoring.'}"
     )
 
-    actions: list[Action] = []
-    do_not_do: list[str] = []
+    # Actions are collected as (priority, action, detail, timeframe, icon, category)
+    # tuples and turned into Action objects once, after sorting
+    raw_actions: list[tuple] = []
+    do_not_do: dict[str, None] = {}     # ordered set, capped at MAX_DO_NOT_DO
+    has_monitor       = False           # set once a "monitor" action is added
     lead_time_warning = ""
     alternative_note  = ""
 
     # ── Decision tree based on disruption type + score + tier ────────────────
 
     for dtype in disruption_types:
-        profile = DISRUPTION_PROFILES.get(dtype, DISRUPTION_PROFILES["other"])
+        profile = DISRUPTION_PROFILES[dtype]
 
         # ── Natural Disaster ──────────────────────────────────────────────────
-        if dtype == "natural_disaster":
+        if dtype == DType.NATURAL_DISASTER:
             if closest_miles is not None and closest_miles < 200:
                 if risk_score >= 60:
-                    actions.append(Action(
-                        priority=1,
-                        action="📦 Stock Up Immediately",
-                        detail=(
+                    raw_actions.append((
+                        1,
+                        "📦 Stock Up Immediately",
+                        (
                             f"A natural disaster is active within {closest_miles} miles of {supplier_city}. "
                             f"Contact {supplier_name} TODAY to confirm current operational status. "
                             f"If operational, place an emergency purchase order for 4–8 weeks of safety stock "
-                            f"before the disruption worsens. Typical recovery: {profile['typical_duration']}."
+                            f"before the disruption worsens. Typical recovery: {profile.duration}."
                         ),
-                        timeframe="Immediate (within 24h)",
-                        icon="📦",
-                        category="inventory"
+                        "Immediate (within 24h)",
+                        "📦",
+                        "inventory"
                     ))
-                    actions.append(Action(
-                        priority=2,
-                        action="🔄 Identify Backup Supplier",
-                        detail=(
+                    raw_actions.append((
+                        2,
+                        "🔄 Identify Backup Supplier",
+                        (
                             f"In parallel, identify at least one alternative supplier for {supplier_category} "
                             f"outside of {supplier_country}. Even if you don't activate them, having a confirmed "
                             f"backup with quoted lead times and pricing protects you if the situation escalates."
                         ),
-                        timeframe="Within 48 hours",
-                        icon="🔄",
-                        category="redirect"
+                        "Within 48 hours",
+                        "🔄",
+                        "redirect"
                     ))
-                    do_not_do.append("Don't wait for official confirmation — natural disasters move faster than communications.")
-                    do_not_do.append("Don't cancel existing orders without confirming the supplier is actually affected.")
+                    _add_dont(do_not_do, "Don't wait for official confirmation — natural disasters move faster than communications.")
+                    _add_dont(do_not_do, "Don't cancel existing orders without confirming the supplier is actually affected.")
                 elif risk_score >= 30:
-                    actions.append(Action(
-                        priority=1,
-                        action="📞 Contact Supplier for Status Update",
-                        detail=(
-                            f"A {dtype.replace('_',' ')} event is within {closest_miles} miles. "
+                    raw_actions.append((
+                        1,
+                        "📞 Contact Supplier for Status Update",
+                        (
+                            f"A {DTYPE_LABELS[dtype]} event is within {closest_miles} miles. "
                             f"Reach out to {supplier_name} to confirm their facilities are unaffected. "
                             f"Request a contingency plan and ask about their own backup production capacity."
                         ),
-                        timeframe="Within 48 hours",
-                        icon="📞",
-                        category="monitor"
+                        "Within 48 hours",
+                        "📞",
+                        "monitor"
                     ))
-                    actions.append(Action(
-                        priority=2,
-                        action="📊 Review Current Inventory Levels",
-                        detail=(
+                    has_monitor = True
+                    raw_actions.append((
+                        2,
+                        "📊 Review Current Inventory Levels",
+                        (
                             f"Check how many weeks of stock you currently hold for {supplier_category} "
                             f"from this supplier. If below 4 weeks, consider a precautionary top-up order."
                         ),
-                        timeframe="This week",
-                        icon="📊",
-                        category="inventory"
+                        "This week",
+                        "📊",
+                        "inventory"
                     ))
 
         # ── Labor Strike ─────────────────────────────────────────────────────
-        elif dtype == "labor_strike":
-            actions.append(Action(
-                priority=1,
-                action="📞 Confirm Strike Scope with Supplier",
-                detail=(
+        elif dtype == DType.LABOR_STRIKE:
+            raw_actions.append((
+                1,
+                "📞 Confirm Strike Scope with Supplier",
+                (
                     f"Strikes are often announced 3–14 days in advance. Contact {supplier_name} immediately "
                     f"to understand: (1) Is it at their specific facility or a nearby port? "
                     f"(2) What is the expected duration? (3) Do they have a contingency shipping plan? "
                     f"Port strikes affect outbound shipping even if the factory is unaffected."
                 ),
-                timeframe="Immediate",
-                icon="📞",
-                category="escalate"
+                "Immediate",
+                "📞",
+                "escalate"
             ))
             if risk_score >= 50:
-                actions.append(Action(
-                    priority=2,
-                    action="📦 Accelerate In-Transit Orders",
-                    detail=(
+                raw_actions.append((
+                    2,
+                    "📦 Accelerate In-Transit Orders",
+                    (
                         f"If you have any orders currently in production or awaiting shipment, "
                         f"request {supplier_name} to expedite shipping before the strike begins. "
                         f"Even a partial shipment now reduces your exposure significantly."
                     ),
-                    timeframe="Within 48 hours",
-                    icon="📦",
-                    category="inventory"
+                    "Within 48 hours",
+                    "📦",
+                    "inventory"
                 ))
-                actions.append(Action(
-                    priority=3,
-                    action="🔀 Map Alternative Shipping Routes",
-                    detail=(
+                raw_actions.append((
+                    3,
+                    "🔀 Map Alternative Shipping Routes",
+                    (
                         f"If the strike is port-specific, ask {supplier_name} if they can route "
                         f"through an alternative port (e.g., if Valencia port is striking, can they "
                         f"ship via Barcelona or Algeciras?). Air freight may be cost-justified for "
                         f"high-value or time-critical items."
                     ),
-                    timeframe="Within 48 hours",
-                    icon="🔀",
-                    category="redirect"
+                    "Within 48 hours",
+                    "🔀",
+                    "redirect"
                 ))
-            do_not_do.append("Don't assume the strike will resolve quickly — port strikes in Europe often last 2–4 weeks.")
+            _add_dont(do_not_do, "Don't assume the strike will resolve quickly — port strikes in Europe often last 2–4 weeks.")
             lead_time_warning = f"Strike-related delays typically add 2–6 weeks to lead times from {supplier_country}."
 
         # ── War / Conflict ────────────────────────────────────────────────────
-        elif dtype == "war_conflict":
-            actions.append(Action(
-                priority=1,
-                action="🚨 Escalate to Procurement Leadership",
-                detail=(
+        elif dtype == DType.WAR_CONFLICT:
+            raw_actions.append((
+                1,
+                "🚨 Escalate to Procurement Leadership",
+                (
                     f"Active conflict near {supplier_city} poses a serious long-term supply risk. "
                     f"This requires executive-level decision making. Escalate immediately with a "
                     f"brief on current inventory levels, open orders, and alternative suppliers."
                 ),
-                timeframe="Immediate",
-                icon="🚨",
-                category="escalate"
+                "Immediate",
+                "🚨",
+                "escalate"
             ))
-            actions.append(Action(
-                priority=2,
-                action="🔄 Begin Supplier Qualification in Safe Region",
-                detail=(
+            raw_actions.append((
+                2,
+                "🔄 Begin Supplier Qualification in Safe Region",
+                (
                     f"Start qualification of an alternative {supplier_category} supplier outside "
                     f"the conflict zone. Target a country with no geopolitical overlap with {supplier_country}. "
                     f"Conflicts rarely resolve within months — plan for 3–12 month supply gap."
                 ),
-                timeframe="This week",
-                icon="🔄",
-                category="dual_source"
+                "This week",
+                "🔄",
+                "dual_source"
             ))
-            actions.append(Action(
-                priority=3,
-                action="📦 Build 60–90 Day Safety Stock",
-                detail=(
+            raw_actions.append((
+                3,
+                "📦 Build 60–90 Day Safety Stock",
+                (
                     f"While the supplier is still operational, build a larger buffer than usual. "
                     f"Conflict situations deteriorate unpredictably. 60–90 days of stock gives you "
                     f"time to qualify and onboard an alternative supplier without production stoppage."
                 ),
-                timeframe="Within 2 weeks",
-                icon="📦",
-                category="inventory"
+                "Within 2 weeks",
+                "📦",
+                "inventory"
             ))
-            do_not_do.append("Don't assume the conflict will stay localized — supply chain impacts spread faster than news coverage.")
-            do_not_do.append("Don't place large new orders that may be undeliverable or create financial risk if supplier becomes unreachable.")
+            _add_dont(do_not_do, "Don't assume the conflict will stay localized — supply chain impacts spread faster than news coverage.")
+            _add_dont(do_not_do, "Don't place large new orders that may be undeliverable or create financial risk if supplier becomes unreachable.")
             alternative_note = f"Finding a {supplier_category} supplier outside {supplier_country} should be treated as a priority project, not a contingency plan."
 
         # ── Trade Policy / Sanctions / Tariffs ───────────────────────────────
-        elif dtype == "trade_policy":
-            actions.append(Action(
-                priority=1,
-                action="⚖️ Assess Tariff / Sanction Impact",
-                detail=(
+        elif dtype == DType.TRADE_POLICY:
+            raw_actions.append((
+                1,
+                "⚖️ Assess Tariff / Sanction Impact",
+                (
                     f"Trade policy changes affecting {supplier_country} could significantly change "
                     f"your landed cost or legality of imports. Engage your trade compliance team or "
                     f"customs broker immediately to understand: (1) Which HS codes are affected? "
                     f"(2) What is the effective date? (3) Are there exemptions?"
                 ),
-                timeframe="Within 48 hours",
-                icon="⚖️",
-                category="escalate"
+                "Within 48 hours",
+                "⚖️",
+                "escalate"
             ))
             if risk_score >= 50:
-                actions.append(Action(
-                    priority=2,
-                    action="📦 Front-Load Orders Before Effective Date",
-                    detail=(
+                raw_actions.append((
+                    2,
+                    "📦 Front-Load Orders Before Effective Date",
+                    (
                         f"If a tariff hike or import ban has an announced effective date, "
                         f"place larger orders now to build inventory at the current duty rate. "
                         f"Calculate the cost differential — even 3–4 months of extra stock may "
                         f"be cheaper than paying higher tariffs on every future shipment."
                     ),
-                    timeframe="This week",
-                    icon="📦",
-                    category="inventory"
+                    "This week",
+                    "📦",
+                    "inventory"
                 ))
-                actions.append(Action(
-                    priority=3,
-                    action="🌍 Evaluate Country-of-Origin Shift",
-                    detail=(
+                raw_actions.append((
+                    3,
+                    "🌍 Evaluate Country-of-Origin Shift",
+                    (
                         f"Explore whether {supplier_name} or a comparable supplier can produce "
                         f"in a country not subject to the new restrictions. Many manufacturers have "
                         f"facilities in multiple countries for exactly this reason. Ask {supplier_name} "
                         f"if they can ship equivalent product from a non-affected facility."
                     ),
-                    timeframe="This month",
-                    icon="🌍",
-                    category="redirect"
+                    "This month",
+                    "🌍",
+                    "redirect"
                 ))
-            do_not_do.append("Don't assume your current classification is correct — tariff schedules are complex and misclassification is common.")
+            _add_dont(do_not_do, "Don't assume your current classification is correct — tariff schedules are complex and misclassification is common.")
 
         # ── Logistics Failure ─────────────────────────────────────────────────
-        elif dtype == "logistics_failure":
-            actions.append(Action(
-                priority=1,
-                action="🚢 Check In-Transit Shipment Status",
-                detail=(
+        elif dtype == DType.LOGISTICS_FAILURE:
+            raw_actions.append((
+                1,
+                "🚢 Check In-Transit Shipment Status",
+                (
                     f"Port congestion or logistics failures affect shipments already en route. "
                     f"Check the status of all open purchase orders from {supplier_name} immediately. "
                     f"Contact your freight forwarder for real-time vessel/container tracking updates."
                 ),
-                timeframe="Immediate",
-                icon="🚢",
-                category="monitor"
+                "Immediate",
+                "🚢",
+                "monitor"
             ))
-            actions.append(Action(
-                priority=2,
-                action="✈️ Evaluate Air Freight for Critical Orders",
-                detail=(
+            has_monitor = True
+            raw_actions.append((
+                2,
+                "✈️ Evaluate Air Freight for Critical Orders",
+                (
                     f"For urgent or high-value orders stuck in congested ports, air freight may be "
                     f"worth the premium. Logistics failures typically resolve in 1–2 weeks, so "
                     f"air freight makes sense only for items that will cause production stoppage."
                 ),
-                timeframe="Within 48 hours",
-                icon="✈️",
-                category="redirect"
+                "Within 48 hours",
+                "✈️",
+                "redirect"
             ))
             lead_time_warning = f"Port congestion typically adds 1–3 weeks to ocean freight lead times from {supplier_country}."
-            do_not_do.append("Don't cancel orders that are already in transit — rerouting is usually cheaper than cancellation fees.")
+            _add_dont(do_not_do, "Don't cancel orders that are already in transit — rerouting is usually cheaper than cancellation fees.")
 
         # ── Shortage ──────────────────────────────────────────────────────────
-        elif dtype == "shortage":
-            actions.append(Action(
-                priority=1,
-                action="📦 Secure Allocation with Supplier",
-                detail=(
+        elif dtype == DType.SHORTAGE:
+            raw_actions.append((
+                1,
+                "📦 Secure Allocation with Supplier",
+                (
                     f"During shortages, suppliers often allocate to their largest or longest-standing "
                     f"customers first. Contact {supplier_name} to formally confirm your allocation "
                     f"and understand if there are quantity limits per order period."
                 ),
-                timeframe="Immediate",
-                icon="📦",
-                category="inventory"
+                "Immediate",
+                "📦",
+                "inventory"
             ))
-            actions.append(Action(
-                priority=2,
-                action="🔍 Qualify Alternative Sources",
-                detail=(
+            raw_actions.append((
+                2,
+                "🔍 Qualify Alternative Sources",
+                (
                     f"Shortages in {supplier_category} typically affect multiple suppliers in the "
                     f"same region. Start qualifying an alternative supplier in a different geography "
                     f"that may have better access to the scarce input material."
                 ),
-                timeframe="This week",
-                icon="🔍",
-                category="dual_source"
+                "This week",
+                "🔍",
+                "dual_source"
             ))
-            do_not_do.append("Don't rely on spot market purchases — during shortages, spot prices can be 2–5x contract rates.")
-
-    # ── Universal monitoring action (always added) ────────────────────────────
-    actions.append(Action(
-        priority=len(actions) + 1,
-        action="📡 Set Up Daily Monitoring",
-        detail=(
-            f"Enable auto-refresh in the dashboard sidebar to track {supplier_name}'s risk score "
-            f"daily. Set a Slack or email alert for when the score crosses 60. "
-            f"Re-evaluate your response plan if the score increases by more than 15 points."
-        ),
-        timeframe="Ongoing",
-        icon="📡",
-        category="monitor"
-    ))
+            _add_dont(do_not_do, "Don't rely on spot market purchases — during shortages, spot prices can be 2–5x contract rates.")
+
+    # ── Universal monitoring action (unless one was already added) ───────────
+    if not has_monitor:
+        raw_actions.append((
+            len(raw_actions) + 1,
+            "📡 Set Up Daily Monitoring",
+            (
+                f"Enable auto-refresh in the dashboard sidebar to track {supplier_name}'s risk score "
+                f"daily. Set a Slack or email alert for when the score crosses 60. "
+                f"Re-evaluate your response plan if the score increases by more than 15 points."
+            ),
+            "Ongoing",
+            "📡",
+            "monitor"
+        ))
 
     # ── Tier-specific lead time warning ──────────────────────────────────────
     if not lead_time_warning:
-        tier_num = str(supplier_tier)
-        if tier_num == "1":
+        if tier_idx == 1:
             lead_time_warning = "As a Tier 1 supplier, any disruption here impacts your production directly. No buffer from downstream."
-        elif tier_num == "2":
+        elif tier_idx == 2:
             lead_time_warning = "As a Tier 2 supplier, your Tier 1 suppliers absorb the first impact. You typically have 1–3 weeks before it reaches you."
         else:
             lead_time_warning = "As a Tier 3 supplier, you have the most buffer time — typically 3–6 weeks before raw material shortages affect production."
@@ -497,7 +606,8 @@ def generate_rule_based_recommendations(
             )
 
     # Sort actions by priority
-    actions.sort(key=lambda a: a.priority)
+    raw_actions.sort(key=itemgetter(0))
+    actions = [Action(*t) for t in raw_actions]
 
     return RecommendationReport(
         supplier_name=supplier_name,
@@ -507,28 +617,15 @@ def generate_rule_based_recommendations(
         actions=actions,
         lead_time_warning=lead_time_warning,
         alternative_note=alternative_note,
-        do_not_do=do_not_do[:4],  # Max 4 don'ts
+        do_not_do=list(do_not_do),
         confidence="rule-based"
     )
 
 
 # ─── GPT-Enhanced Recommendations ────────────────────────────────────────────
 
-GPT_RECOMMENDATION_PROMPT = """You are a senior supply chain risk consultant. A client needs urgent, practical advice about a supplier risk situation.
-
-Supplier: {supplier_name}
-Location: {city}, {country}
-Category: {category}
-Tier: {tier}
-Risk Score: {score}/100 ({level})
-Top Events Driving Risk:
-{events_text}
-
-Provide a JSON response with this exact structure:
-{{
+GPT_RESPONSE_STRUCTURE = """{{
   "situation_summary": "2-3 sentence plain English summary of what is happening and why it matters",
-  "urgency": "CRITICAL|HIGH|MEDIUM|LOW|WATCH",
-  "primary_recommendation": "The single most important thing to do right now",
   "actions": [
     {{
       "priority": 1,
@@ -538,23 +635,171 @@ Provide a JSON response with this exact structure:
       "category": "inventory|redirect|dual_source|monitor|escalate"
     }}
   ],
-  "stock_up_recommendation": {{
-    "should_stock_up": true or false,
-    "weeks_of_stock": "recommended safety stock in weeks e.g. 6-8",
-    "reasoning": "one sentence"
-  }},
   "redirect_recommendation": {{
-    "should_redirect": true or false,
     "alternative_regions": ["list of alternative regions/countries to source from"],
     "reasoning": "one sentence"
   }},
   "lead_time_warning": "Specific lead time concern for this situation",
-  "do_not_do": ["mistake 1", "mistake 2", "mistake 3"],
-  "confidence": 0-100
-}}
+  "do_not_do": ["mistake 1", "mistake 2", "mistake 3"]
+}}"""
+
+# Structured-output schemas mirroring GPT_RESPONSE_STRUCTURE. The API enforces
+# them, so responses carry only the fields the report actually uses.
+class ActionSchema(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    priority: int
+    action: str
+    detail: str
+    timeframe: Literal["Immediate", "Within 48h", "This week", "This month", "Ongoing"]
+    category: Literal["inventory", "redirect", "dual_source", "monitor", "escalate"]
+
+
+class RedirectSchema(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    alternative_regions: list[str]
+    reasoning: str
+
+
+class AIRecSchema(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    situation_summary: str
+    actions: list[ActionSchema]
+    redirect_recommendation: RedirectSchema
+    lead_time_warning: str
+    do_not_do: list[str]
+
+
+class AIRecBatchSchema(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    recommendations: list[AIRecSchema]
+
+
+GPT_RECOMMENDATION_PROMPT = """You are a senior supply chain risk consultant. A client needs urgent, practical advice about a supplier risk situation.
+
+Supplier: {supplier_name}
+Location: {city}, {country}
+Category: {category}
+Tier: {tier}
+Risk Score: {score}/100 ({level})
+Top Events Driving Risk:
+{events_text}
+
+Provide a JSON response with this exact structure:
+""" + GPT_RESPONSE_STRUCTURE + """
 
 Be specific, practical, and direct. No generic advice. Reference the actual events and location."""
 
+GPT_BATCH_SUPPLIER_BLOCK = """Supplier {index}: {supplier_name}
+Location: {city}, {country} | Category: {category} | Tier: {tier} | Risk Score: {score}/100 ({level})
+Top Events Driving Risk:
+{events_text}"""
+
+GPT_BATCH_RECOMMENDATION_PROMPT = """You are a senior supply chain risk consultant. A client needs urgent, practical advice about {count} supplier risk situations.
+
+{suppliers_text}
+
+Provide a JSON response of the form {{"recommendations": [...]}} where the array holds exactly {count} objects, one per supplier in the order listed above. Each object must have this exact structure:
+""" + GPT_RESPONSE_STRUCTURE + """
+
+Be specific, practical, and direct. No generic advice. Reference the actual events and location of each supplier."""
+
+_TEMPLATE_FIELD = re.compile(r"\{(\w+)\}")
+
+
+def _compile_prompt(template: str) -> tuple[str, ...]:
+    """
+    Split a str.format-style template once into alternating literal text and
+    field names, so rendering is a single join with no format-string parsing.
+    """
+    parts = _TEMPLATE_FIELD.split(template)
+    return tuple(
+        part if i % 2 else part.replace("{{", "{").replace("}}", "}")
+        for i, part in enumerate(parts)
+    )
+
+
+def _render_prompt(parts: tuple[str, ...], ctx: dict) -> str:
+    """Fill a template compiled by _compile_prompt from ctx."""
+    return "".join(str(ctx[p]) if i % 2 else p for i, p in enumerate(parts))
+
+
+_RECOMMENDATION_PROMPT_PARTS       = _compile_prompt(GPT_RECOMMENDATION_PROMPT)
+_BATCH_SUPPLIER_BLOCK_PARTS        = _compile_prompt(GPT_BATCH_SUPPLIER_BLOCK)
+_BATCH_RECOMMENDATION_PROMPT_PARTS = _compile_prompt(GPT_BATCH_RECOMMENDATION_PROMPT)
+
+AI_MAX_TOKENS      = 800 # Output budget per supplier
+AI_BATCH_SIZE      = 8   # Suppliers packed into one GPT request
+AI_MAX_CONCURRENCY = 4   # GPT batch requests in flight at once
+
+AI_ICON_MAP = {
+    "inventory":    "📦",
+    "redirect":     "🔄",
+    "dual_source":  "🔀",
+    "monitor":      "📡",
+    "escalate":     "🚨",
+}
+
+
+def _events_text(breakdown: list[dict]) -> str:
+    """Format the counted events of a breakdown as prompt bullet lines."""
+    return "\n".join(
+        f"- [{e.signal.upper()}] {e.title} ({e.proximity}, {e.published})"
+        for e in _digest_breakdown(breakdown).top5_counted
+    ) or "No specific events detected."
+
+
+def _ai_cache_key(prompt: str) -> str:
+    """Hash a rendered prompt into its ai_cache key."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def _load_cached_ai(cache_key: str, schema):
+    """Return the cached response for cache_key parsed into schema, or None."""
+    raw = get_cached_ai_response(cache_key)
+    if raw is None:
+        return None
+    try:
+        return schema.model_validate_json(raw)
+    except Exception:
+        return None     # written under an older schema — treat as a miss
+
+
+def _ai_data_to_report(
+    data: AIRecSchema,
+    supplier_name: str,
+    risk_score: float,
+    risk_level: str,
+) -> RecommendationReport:
+    """Convert one parsed GPT recommendation into a RecommendationReport."""
+    actions = [
+        Action(
+            priority=a.priority,
+            action=a.action,
+            detail=a.detail,
+            timeframe=a.timeframe,
+            icon=AI_ICON_MAP.get(a.category, "📋"),
+            category=a.category
+        )
+        for a in data.actions
+    ]
+
+    redirect = data.redirect_recommendation
+    alt_note = redirect.reasoning
+    if redirect.alternative_regions:
+        alt_note = f"Consider sourcing from: {', '.join(redirect.alternative_regions[:3])}. {alt_note}"
+
+    return RecommendationReport(
+        supplier_name=supplier_name,
+        risk_score=risk_score,
+        risk_level=risk_level,
+        situation_summary=data.situation_summary,
+        actions=sorted(actions, key=lambda a: a.priority),
+        lead_time_warning=data.lead_time_warning,
+        alternative_note=alt_note,
+        do_not_do=data.do_not_do[:MAX_DO_NOT_DO],
+        confidence="ai-enhanced"
+    )
+
 
 def generate_ai_recommendations(
     supplier_name: str,
@@ -565,92 +810,134 @@ def generate_ai_recommendations(
     risk_score: float,
     risk_level: str,
     breakdown: list[dict],
-    openai_api_key: str
+    openai_api_key: str,
+    no_cache: bool = False
 ) -> Optional[RecommendationReport]:
     """
     Generate GPT-enhanced recommendations. Falls back to None if unavailable.
+    Responses are cached on disk for 24h by prompt hash; pass no_cache=True
+    to force a fresh call.
     """
     if not openai_api_key:
         return None
 
-    # Build events text for prompt
-    counted = [e for e in breakdown if e.get("counted")][:5]
-    events_text = "\n".join(
-        f"- [{e['signal'].upper()}] {e['title']} ({e['proximity']}, {e['published']})"
-        for e in counted
-    ) or "No specific events detected."
-
-    prompt = GPT_RECOMMENDATION_PROMPT.format(
-        supplier_name=supplier_name,
-        city=supplier_city,
-        country=supplier_country,
-        category=supplier_category,
-        tier=supplier_tier,
-        score=f"{risk_score:.0f}",
-        level=risk_level,
-        events_text=events_text
-    )
+    prompt = _render_prompt(_RECOMMENDATION_PROMPT_PARTS, {
+        "supplier_name": supplier_name,
+        "city":          supplier_city,
+        "country":       supplier_country,
+        "category":      supplier_category,
+        "tier":          supplier_tier,
+        "score":         f"{risk_score:.0f}",
+        "level":         risk_level,
+        "events_text":   _events_text(breakdown),
+    })
 
     try:
         import openai
     except ImportError:
-        openai = None
+        return None
+
+    cache_key = _ai_cache_key(prompt)
+    if not no_cache:
+        data = _load_cached_ai(cache_key, AIRecSchema)
+        if data is not None:
+            return _ai_data_to_report(data, supplier_name, risk_score, risk_level)
+
+    try:
         client = openai.OpenAI(api_key=openai_api_key)
 
-        response = client.chat.completions.create(
+        response = client.chat.completions.parse(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": prompt}],
-            max_tokens=1200,
+            max_tokens=AI_MAX_TOKENS,
             temperature=0.3,
-            response_format={"type": "json_object"}
+            response_format=AIRecSchema
         )
 
-        data = json.loads(response.choices[0].message.content)
-
-        # Convert to RecommendationReport
-        actions = []
-        for a in data.get("actions", []):
-            icon_map = {
-                "inventory":    "📦",
-                "redirect":     "🔄",
-                "dual_source":  "🔀",
-                "monitor":      "📡",
-                "escalate":     "🚨",
-            }
-            cat = a.get("category", "monitor")
-            actions.append(Action(
-                priority=a.get("priority", 99),
-                action=a.get("action", ""),
-                detail=a.get("detail", ""),
-                timeframe=a.get("timeframe", "This week"),
-                icon=icon_map.get(cat, "📋"),
-                category=cat
-            ))
-
-        stock = data.get("stock_up_recommendation", {})
-        redirect = data.get("redirect_recommendation", {})
-
-        alt_regions = redirect.get("alternative_regions", [])
-        alt_note = redirect.get("reasoning", "")
-        if alt_regions:
-            alt_note = f"Consider sourcing from: {', '.join(alt_regions[:3])}. {alt_note}"
-
-        return RecommendationReport(
-            supplier_name=supplier_name,
-            risk_score=risk_score,
-            risk_level=risk_level,
-            situation_summary=data.get("situation_summary", ""),
-            actions=sorted(actions, key=lambda a: a.priority),
-            lead_time_warning=data.get("lead_time_warning", ""),
-            alternative_note=alt_note,
-            do_not_do=data.get("do_not_do", [])[:4],
-            confidence="ai-enhanced"
-        )
+        message = response.choices[0].message
+        data = message.parsed
+        if data is None:    # model refused
+            return None
+        cache_ai_response(cache_key, message.content)
+        return _ai_data_to_report(data, supplier_name, risk_score, risk_level)
 
     except Exception:
         return None
 
 
+def generate_ai_recommendations_batch(
+    suppliers: list[dict],
+    openai_api_key: str,
+    no_cache: bool = False
+) -> list[Optional[RecommendationReport]]:
+    """
+    Generate GPT-enhanced recommendations for many suppliers, packing up to
+    AI_BATCH_SIZE suppliers into each request.
+
+    Each supplier dict carries the keyword arguments of generate_ai_recommendations
+    (minus the API key). Returns one entry per supplier, in input order — None
+    where the AI result is unavailable. Each batch response is cached like
+    generate_ai_recommendations.
+    """
+    reports: list[Optional[RecommendationReport]] = [None] * len(suppliers)
+    if not openai_api_key or not suppliers:
+        return reports
+
+    try:
+        import openai
+    except ImportError:
+        return reports
+
+    client = openai.OpenAI(api_key=openai_api_key)
+
+    for start in range(0, len(suppliers), AI_BATCH_SIZE):
+        chunk = suppliers[start:start + AI_BATCH_SIZE]
+        suppliers_text = "\n\n".join(
+            _render_prompt(_BATCH_SUPPLIER_BLOCK_PARTS, {
+                "index":         i + 1,
+                "supplier_name": s["supplier_name"],
+                "city":          s["supplier_city"],
+                "country":       s["supplier_country"],
+                "category":      s["supplier_category"],
+                "tier":          s["supplier_tier"],
+                "score":         f"{s['risk_score']:.0f}",
+                "level":         s["risk_level"],
+                "events_text":   _events_text(s["breakdown"]),
+            })
+            for i, s in enumerate(chunk)
+        )
+        prompt = _render_prompt(_BATCH_RECOMMENDATION_PROMPT_PARTS, {
+            "count":          len(chunk),
+            "suppliers_text": suppliers_text,
+        })
+
+        cache_key = _ai_cache_key(prompt)
+        parsed = None if no_cache else _load_cached_ai(cache_key, AIRecBatchSchema)
+        if parsed is None:
+            try:
+                response = client.chat.completions.parse(
+                    model="gpt-4o-mini",
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=AI_MAX_TOKENS * len(chunk),
+                    temperature=0.3,
+                    response_format=AIRecBatchSchema
+                )
+                message = response.choices[0].message
+                parsed = message.parsed
+            except Exception:
+                continue
+            if parsed is None:
+                continue
+            cache_ai_response(cache_key, message.content)
+
+        for i, (s, data) in enumerate(zip(chunk, parsed.recommendations)):
+            reports[start + i] = _ai_data_to_report(
+                data, s["supplier_name"], s["risk_score"], s["risk_level"]
+            )
+
+    return reports
+
+
 # ─── Master Entry Point ───────────────────────────────────────────────────────
 
 def get_recommendations(
@@ -663,7 +950,8 @@ def get_recommendations(
     risk_level: str,
     breakdown: list[dict],
     events_summary: str = "",
-    openai_api_key: str = ""
+    openai_api_key: str = "",
+    no_cache: bool = False
 ) -> RecommendationReport:
     """
     Generate recommendations using AI if available, otherwise rule-based.
@@ -674,7 +962,7 @@ def get_recommendations(
         ai_report = generate_ai_recommendations(
             supplier_name, supplier_city, supplier_country,
             supplier_tier, supplier_category,
-            risk_score, risk_level, breakdown, openai_api_key
+            risk_score, risk_level, breakdown, openai_api_key, no_cache
         )
         if ai_report:
             return ai_report
@@ -685,3 +973,46 @@ def get_recommendations(
         supplier_tier, supplier_category,
         risk_score, risk_level, breakdown, events_summary
     )
+
+
+def _rule_based_entry(supplier: dict) -> RecommendationReport:
+    """Unpack one supplier dict into generate_rule_based_recommendations."""
+    return generate_rule_based_recommendations(
+        supplier["supplier_name"], supplier["supplier_city"], supplier["supplier_country"],
+        supplier["supplier_tier"], supplier["supplier_category"],
+        supplier["risk_score"], supplier["risk_level"], supplier["breakdown"],
+        supplier.get("events_summary", "")
+    )
+
+
+def get_recommendations_many(
+    suppliers: list[dict],
+    openai_api_key: str = "",
+    no_cache: bool = False
+) -> list[RecommendationReport]:
+    """
+    Portfolio-wide get_recommendations. Each supplier dict carries the keyword
+    arguments of get_recommendations (minus the API key).
+
+    GPT batches run concurrently (up to AI_MAX_CONCURRENCY requests in flight);
+    any supplier without an AI result falls back to the rule-based engine.
+    Returns one report per supplier, in input order.
+    """
+    reports: list[Optional[RecommendationReport]] = [None] * len(suppliers)
+
+    if openai_api_key and suppliers:
+        starts = range(0, len(suppliers), AI_BATCH_SIZE)
+        with ThreadPoolExecutor(max_workers=AI_MAX_CONCURRENCY) as pool:
+            batches = pool.map(
+                lambda start: generate_ai_recommendations_batch(
+                    suppliers[start:start + AI_BATCH_SIZE], openai_api_key, no_cache
+                ),
+                starts
+            )
+            for start, batch in zip(starts, batches):
+                reports[start:start + len(batch)] = batch
+
+    return [
+        report if report is not None else _rule_based_entry(supplier)
+        for supplier, report in zip(suppliers, reports)
+    ]
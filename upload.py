@@ -23,7 +23,7 @@ def validate_csv(df: pd.DataFrame) -> tuple[bool, str]:
     # Check for empty critical fields
     critical = ["Supplier Name", "Country"]
     for col in critical:
-        if df[col].isnull().any() or (df[col].astype(str).str.strip() == "").any():
+        if df[col].isnull().any() or df[col].str.strip().eq("").any():
             return False, f"Column '{col}' contains empty values. Please fill all rows."
 
     return True, f"✅ {len(df)} suppliers validated successfully."
@@ -35,7 +35,9 @@ def process_upload(uploaded_file) -> pd.DataFrame | None:
     Returns the DataFrame if successful, None otherwise.
     """
     try:
-        df = pd.read_csv(uploaded_file)
+        # Every field is text (Tier included — the suppliers table stores it
+        # as TEXT), so validation needs no further string conversion
+        df = pd.read_csv(uploaded_file, dtype=str)
     except Exception as e:
         st.error(f"Failed to read CSV: {e}")
         return None